@@ -7,6 +7,7 @@
 
 from bisect import insort
 
+import matplotlib.artist
 import numpy as np
 from matplotlib.animation import FFMpegFileWriter
 from matplotlib.collections import PatchCollection, LineCollection
@@ -204,7 +205,7 @@ class PlotAnimationCanvas(PlotCanvas):
 
     def update_time_labels(self):
         """Update additional node labels"""
-        nodeLabelSize = int(round(self.nodeLabelFontSize))
+        nodeLabelSize = self._nodeLabelSizeInt
 
         for v, label in self.additionalNodeLabelCollection.items():  # type(label) = matplotlib.text.Text object
             label.remove()
@@ -376,6 +377,7 @@ class PlotAnimationCanvas(PlotCanvas):
             self.currentYlim = self.Ylim
             self.mouseWheelPressed = True
             self.mouseWheelPressedPosition = (xAbsolute, yAbsolute)
+            self.connect_motion()
             return
 
     def on_release(self, event):
@@ -397,11 +399,13 @@ class PlotAnimationCanvas(PlotCanvas):
             # Wheel has been released
             self.mouseWheelPressed = False
             self.mouseWheelPressedPosition = None
+            self.disconnect_motion()
 
         elif action == 3:
             # Right mouse has been released
             self.mouseRightPressed = False
             self.selectedNode = None
+            self.disconnect_motion()
 
     def draw_edges(self, G, pos,
                    edgelist=None,
@@ -415,6 +419,7 @@ class PlotAnimationCanvas(PlotCanvas):
                    ax=None,
                    arrows=True,
                    label=None,
+                   box_pos=None,
                    **kwds):
         """Workaround to call specific edge drawing function"""
 
@@ -429,7 +434,8 @@ class PlotAnimationCanvas(PlotCanvas):
                    edge_vmax,
                    ax,
                    arrows,
-                   label)
+                   label,
+                   box_pos=box_pos)
 
         self.tube_collection = tubes
         return edges, boxes, arrows
@@ -437,26 +443,34 @@ class PlotAnimationCanvas(PlotCanvas):
     def zoom(self, factor=None):
         """Zoom by a factor"""
         if factor is not None:
-            smaller = lambda val: factor * val  # Returns smaller value if factor < 1, i.e. if zooming out
-            bigger = lambda val: (1. / factor) * val  # Returns bigger value if factor < 1, i.e. if zooming out
-        else:
-            smaller = lambda val: val
-            bigger = lambda val: val
-
-        # Scale axis
-        self.Xlim = tuple(bigger(entry) for entry in self.Xlim)
-        self.Ylim = tuple(bigger(entry) for entry in self.Ylim)
-        self.axes.set_xlim(self.Xlim)
-        self.axes.set_ylim(self.Ylim)
+            # Scale limits and sizes; new arrays instead of in-place so stored viewpoints stay intact
+            self.Xlim = np.multiply(self.Xlim, 1. / factor)
+            self.Ylim = np.multiply(self.Ylim, 1. / factor)
+            self.edgeWidthSize *= factor
+            self.tubeWidthFactor *= factor
+            self.nodeLabelFontSize *= factor
+            self.edgeLabelFontSize *= factor
+
+        viewState = (self.Xlim[0], self.Xlim[1], self.Ylim[0], self.Ylim[1],
+                     self.edgeWidthSize, self.tubeWidthFactor, self.nodeLabelFontSize, self.edgeLabelFontSize)
+        if viewState == self._appliedViewState:
+            # Nothing changed, artists are up to date
+            if not self._suppressDraw:
+                self.draw_idle()
+            return
+        self._appliedViewState = viewState
+        self._transformDirty = True  # Scaled limits change the screen angles of the edge labels
+
+        # With factor None the current state is simply re-applied to the artists
+        self.axes.set_xlim(self.Xlim[0], self.Xlim[1])
+        self.axes.set_ylim(self.Ylim[0], self.Ylim[1])
 
         # Scale edge widths
-        self.edgeWidthSize = smaller(self.edgeWidthSize)
         #edgeWithSize = max(1, int(round(self.edgeWidthSize)))
-        for edges, edgeCollection in self.edgeCollections:
-            edgeCollection.set_linewidth(self.edgeWidthSize)
+        if self.edgeCollection is not None:
+            self.edgeCollection.set_linewidth(self.edgeWidthSize)
 
         # Scale tubes
-        self.tubeWidthFactor = smaller(self.tubeWidthFactor)
         #self.tube_collection.set_linewidth(self.tubeWidthSize)
 
         # Scale colored edges if existing
@@ -465,23 +479,24 @@ class PlotAnimationCanvas(PlotCanvas):
             for fk, fkEdgeColoring in edgeCollection.items():
                 fkEdgeColoring.set_linewidth(self.tubeWidthFactor*self.widthReferenceSize[edge][fk])
 
-        # Scale font size of node labels
-        self.nodeLabelFontSize = smaller(self.nodeLabelFontSize)
-        nodeLabelSize = int(round(self.nodeLabelFontSize))
-        for v, label in self.nodeLabelCollection.items():
-            label.set_fontsize(nodeLabelSize)
-
-        # Scale font size of Additional Node Labels, if existing
-        for v, label in self.additionalNodeLabelCollection.items():
-            label.set_fontsize(nodeLabelSize)
+        # Scale font size of node labels (setp batches the updates instead of a Python loop per dict).
+        # Skipped entirely when the rounded size did not change since the last zoom tick
+        nodeLabelSize = int(self.nodeLabelFontSize + 0.5)
+        if nodeLabelSize != self._nodeLabelSizeInt:
+            self._nodeLabelSizeInt = nodeLabelSize
+            nodeLabels = list(self.nodeLabelCollection.values()) + list(self.additionalNodeLabelCollection.values())
+            if nodeLabels:
+                matplotlib.artist.setp(nodeLabels, fontsize=nodeLabelSize)
 
         # Scale font size of edge labels
-        self.edgeLabelFontSize = smaller(self.edgeLabelFontSize)
-        edgeLabelSize = int(round(self.edgeLabelFontSize))
-        for edge, label in self.edgeLabelCollection.items():
-            label.set_fontsize(edgeLabelSize)
-
-        self.draw_idle()
+        edgeLabelSize = int(self.edgeLabelFontSize + 0.5)
+        if edgeLabelSize != self._edgeLabelSizeInt:
+            self._edgeLabelSizeInt = edgeLabelSize
+            if self.edgeLabelCollection:
+                matplotlib.artist.setp(list(self.edgeLabelCollection.values()), fontsize=edgeLabelSize)
+
+        if not self._suppressDraw:
+            self.draw_idle()
 
     def export(self, path):
         """Export mp4-video of animation to path. This requires FFMPEG."""
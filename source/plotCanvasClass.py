@@ -5,8 +5,9 @@
 # Description:  Class to plot networkx graphs in widgets and control click events
 # ===========================================================================
 
-from math import sqrt
+from contextlib import contextmanager
 
+import matplotlib.artist
 import matplotlib.figure
 import networkx as nx
 import numpy as np
@@ -14,6 +15,12 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.colors import colorConverter
 from networkx import draw_networkx_labels, draw_networkx_edge_labels
 
+try:
+    # Used to prune the candidate set in check_edge_clicked. Optional, as SciPy is not a hard requirement
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
 from source.utilitiesClass import Utilities
 
 # Config
@@ -26,6 +33,10 @@ SIMILARITY_DIST = 9  # Maximal distance at which a click is recognized as a clic
 class PlotCanvas(FigureCanvas):
     """Class to plot networkx graphs in widgets and control click events"""
 
+    # All colors edgeColor (and its subclass overrides) can return, converted once instead of
+    # calling colorConverter.to_rgba per edge
+    RGBA = {c: colorConverter.to_rgba(c, 1) for c in ('b', 'r', 'gray', 'black', 'blue', 'red')}
+
     def __init__(self, graph, interface, stretchFactor=1.57, onlyNTF=False, type='general', showArrows=True):
         self.figure = matplotlib.figure.Figure()
         super(PlotCanvas, self).__init__(self.figure)  # Call parents constructor
@@ -36,27 +47,63 @@ class PlotCanvas(FigureCanvas):
         self.type = type  # 'general' or 'spillback'
         self.showArrows = showArrows
 
+        # type and onlyNTF never change, so the matching label builder is bound once instead of
+        # branching on every get_edge_labels call
+        self._edgeLabelBuilder = {('general', False): self._build_general_labels,
+                                  ('general', True): self._build_general_ntf_labels,
+                                  ('spillback', False): self._build_spillback_labels,
+                                  ('spillback', True): self._build_spillback_ntf_labels}[(self.type, bool(self.onlyNTF))]
+
         # Visualization Settings
         sqSize = 120
-        self.Xlim = (stretchFactor * (-sqSize), stretchFactor * sqSize)
-        self.Ylim = (-sqSize, sqSize)
+        self.Xlim = np.array([stretchFactor * (-sqSize), stretchFactor * sqSize])
+        self.Ylim = np.array([-sqSize, sqSize], dtype=float)
         self.nodeSize = 24 ** 2
         self.nodeLabelFontSize = 9  # float but passed as int
         self.edgeLabelFontSize = 7  # float but passed as int
         self.edgeWidthSize = 4
+        # Rounded font sizes that are actually passed to matplotlib, kept in sync by zoom()
+        self._nodeLabelSizeInt = int(self.nodeLabelFontSize + 0.5)
+        self._edgeLabelSizeInt = int(self.edgeLabelFontSize + 0.5)
 
         # Only one of them can be not None
         self.focusNode = None
         self.focusEdge = None
 
+        # Focus state that has been rendered last, used to skip redundant recolor calls
+        self._lastFocusNode = None
+        self._lastFocusEdge = None
+        # View state (limits and sizes) that zoom() has applied last, to skip redundant refreshes
+        self._appliedViewState = None
+        # Edge label rotations cached per edge; invalid once the data-to-screen scale changes
+        self._labelRotationCache = {}
+        self._transformDirty = True
+
         # Internal variables
         self.selectedNode = None
-
-        # Signals
+        self._edgeHitCache = None  # Spatial index of edges used by check_edge_clicked, built lazily
+        self._nodeHitCache = None  # Node positions as array used by check_node_clicked, built lazily
+        self._positionCache = None  # Dict of node positions, rebuilt lazily after every position change
+        self._edgePosCache = None  # (|E|, 2, 2) array of edge endpoint positions, invalidated with it
+        self._lastEdgeLabelText = {}  # Last rendered label value per edge, to skip unchanged labels
+        self._edgeColorCache = {}  # Memoized RGBA value per edge, only valid for _edgeColorCacheFocus
+        self._edgeColorCacheFocus = None
+        self._suppressDraw = 0  # Nesting depth of batched_draws; while > 0 no redraw is scheduled
+        self._dragBackground = None  # Rasterized background of all static artists while dragging a node
+
+        # Qt emits motion events faster than the canvas can render, so motion events only store their
+        # position and a single-shot timer coalesces bursts into one redraw per interval
+        self._pendingMotion = None
+        self._motionTimer = self.new_timer(interval=16)
+        self._motionTimer.single_shot = True
+        self._motionTimer.add_callback(self.process_pending_motion)
+
+        # Signals. The motion handler is only connected while a mouse button is held (see connect_motion)
         self.mpl_connect('button_press_event', self.on_click)
         self.mpl_connect('button_release_event', self.on_release)
-        self.mpl_connect('motion_notify_event', self.on_motion)
         self.mpl_connect('scroll_event', self.on_scroll)
+        self.mpl_connect('resize_event', self.on_resize)
+        self._motionCid = None
 
         # Mouse events
         # Mouse wheel
@@ -74,35 +121,54 @@ class PlotCanvas(FigureCanvas):
 
     def get_edge_labels(self):
         """Returns dict of edge labels"""
-        if self.type == 'general':
-            attributes = ['outCapacity', 'transitTime'] if not self.onlyNTF else ['outCapacity']
-            multipleBool = (len(attributes) > 1)
-        elif self.type == 'spillback':
-            attributes = ['inCapacity', 'outCapacity', 'storage', 'transitTime'] if not self.onlyNTF \
-                            else ['outCapacity'] # 'inflowBound' has to be added manually below
-            multipleBool = True
-        attributeList = [nx.get_edge_attributes(self.network, attr) for attr in attributes]
-        if (self.type == 'spillback' and self.onlyNTF):
-            attr = 'inflowBound'
-            d = dict()
-            for e in self.network.edges():
-                (v, w) = e
-                d[e] = self.network[v][w]['TFC'][attr]
-            attributeList.append(d)
-
-        labelDict = Utilities.join_intersect_dicts(*attributeList)
-
-        # Integer values should be displayed in shortest possible way
-        for key, valTuple in labelDict.items():
-            if not multipleBool:
-                if valTuple != float('inf') and valTuple == int(valTuple):
-                    labelDict[key] = int(valTuple)
-            else:
-                newTuple = []
-                for val in valTuple:
-                    newTuple.append(int(val) if (val != float('inf') and int(val) == val) else val)
-                labelDict[key] = tuple(newTuple)
-        return labelDict
+        return self._edgeLabelBuilder()
+
+    # Specialized label builders, one per (type, onlyNTF) combination. Integer values should be
+    # displayed in shortest possible way; the int-vs-float classification runs vectorized over all
+    # label values at once. Note the .tolist() calls: the rendered labels should contain Python
+    # scalars, not numpy ones
+
+    def _shorten_label_values(self, values):
+        """Vectorized check which label values are finite integers"""
+        valueArray = np.array(values, dtype=float)
+        intMask = np.isfinite(valueArray) & (valueArray == np.floor(valueArray))
+        return valueArray.tolist(), intMask.tolist()
+
+    def _build_general_labels(self):
+        edges = list(self.network.edges(data=True))
+        if not edges:
+            return {}
+        values, intMask = self._shorten_label_values([(d['outCapacity'], d['transitTime'])
+                                                      for v, w, d in edges])
+        return {(v, w): tuple(int(val) if isInt else val for val, isInt in zip(row, maskRow))
+                for (v, w, d), row, maskRow in zip(edges, values, intMask)}
+
+    def _build_general_ntf_labels(self):
+        edges = list(self.network.edges(data=True))
+        if not edges:
+            return {}
+        values, intMask = self._shorten_label_values([d['outCapacity'] for v, w, d in edges])
+        return {(v, w): (int(val) if isInt else val)
+                for (v, w, d), val, isInt in zip(edges, values, intMask)}
+
+    def _build_spillback_labels(self):
+        edges = list(self.network.edges(data=True))
+        if not edges:
+            return {}
+        values, intMask = self._shorten_label_values([(d['inCapacity'], d['outCapacity'],
+                                                       d['storage'], d['transitTime'])
+                                                      for v, w, d in edges])
+        return {(v, w): tuple(int(val) if isInt else val for val, isInt in zip(row, maskRow))
+                for (v, w, d), row, maskRow in zip(edges, values, intMask)}
+
+    def _build_spillback_ntf_labels(self):
+        edges = list(self.network.edges(data=True))
+        if not edges:
+            return {}
+        values, intMask = self._shorten_label_values([(d['outCapacity'], d['TFC']['inflowBound'])
+                                                      for v, w, d in edges])
+        return {(v, w): tuple(int(val) if isInt else val for val, isInt in zip(row, maskRow))
+                for (v, w, d), row, maskRow in zip(edges, values, intMask)}
 
     def on_click(self, event):
         """
@@ -137,15 +203,17 @@ class PlotCanvas(FigureCanvas):
 
                 self.interface.update_node_display()
                 self.interface.update_edge_display()
-                self.update_nodes(color=True)
-                self.update_edges(color=True)
+                with self.batched_draws():
+                    self.update_nodes(color=True)
+                    self.update_edges(color=True)
             elif clickedNode is not None:
                 self.focusNode = clickedNode
                 self.focusEdge = None
-                self.update_edges(color=True)
-                self.interface.update_edge_display()
-                self.selectedNode = clickedNode
-                self.update_nodes(added=newNodeCreated, color=True)
+                with self.batched_draws():
+                    self.update_edges(color=True)
+                    self.interface.update_edge_display()
+                    self.selectedNode = clickedNode
+                    self.update_nodes(added=newNodeCreated, color=True)
 
                 if newNodeCreated:
                     self.interface.add_node_to_list(self.focusNode)
@@ -154,6 +222,7 @@ class PlotCanvas(FigureCanvas):
             # Wheel was clicked, move visible part of canvas
             self.mouseWheelPressed = True
             self.mouseWheelPressedPosition = (xAbsolute, yAbsolute)
+            self.connect_motion()
             return
 
         elif action == 3:
@@ -161,10 +230,12 @@ class PlotCanvas(FigureCanvas):
             if clickedNode is not None:
                 self.selectedNode = clickedNode
                 self.mouseRightPressed = True
+                self.connect_motion()
                 self.focusNode = self.selectedNode
                 self.focusEdge = None
-                self.update_edges(color=True)
-                self.update_nodes(color=True)
+                with self.batched_draws():
+                    self.update_edges(color=True)
+                    self.update_nodes(color=True)
                 self.interface.update_edge_display()
                 self.interface.update_node_display()
 
@@ -224,34 +295,131 @@ class PlotCanvas(FigureCanvas):
             # Wheel has been released
             self.mouseWheelPressed = False
             self.mouseWheelPressedPosition = None
+            self.disconnect_motion()
 
         elif action == 3:
             # Right mouse has been released
             self.mouseRightPressed = False
+            self.end_drag()
             self.selectedNode = None
+            self.disconnect_motion()
 
     def on_motion(self, event):
         """
-        Move-Mouse-event handling
+        Move-Mouse-event handling. Only remembers the latest position, the actual redraw
+        is performed by process_pending_motion once the coalescing timer fires
         :param event: event which is emitted by matplotlib
         """
         if event.xdata is None or event.ydata is None:
             return
 
+        alreadyPending = (self._pendingMotion is not None)
+        self._pendingMotion = (event.xdata, event.ydata)
+        if not alreadyPending:
+            self._motionTimer.start()
+
+    def process_pending_motion(self):
+        """Perform the update for the most recent motion event"""
+        if self._pendingMotion is None:
+            return
+
         # Note: event.x/y = relative position, event.xdata/ydata = absolute position
-        xAbsolute, yAbsolute = event.xdata, event.ydata
+        xAbsolute, yAbsolute = self._pendingMotion
+        self._pendingMotion = None
 
         if self.mouseWheelPressed and self.mouseWheelPressedPosition is not None:
             self.mouseWheelPosition = (xAbsolute, yAbsolute)
             self.move()
-            self.draw_idle()
+            if not self._suppressDraw:
+                self.draw_idle()
 
         elif self.mouseRightPressed and self.selectedNode is not None:
             self.network.nodes[self.selectedNode]['position'] = (xAbsolute, yAbsolute)
-            self.update_nodes(moved=True, color=True)
-            self.update_edges(moved=True)
+            if self._dragBackground is None:
+                self.capture_drag_background()
+            with self.batched_draws(draw=False):
+                self.update_nodes(moved=True, color=True)
+                self.update_edges(moved=True)
+            self.draw_drag_frame()
             self.interface.update_node_display()
 
+    def connect_motion(self):
+        """Connect the motion handler while a mouse button is held, to not pay for no-op callbacks while hovering"""
+        if self._motionCid is None:
+            self._motionCid = self.mpl_connect('motion_notify_event', self.on_motion)
+
+    def disconnect_motion(self):
+        """Disconnect the motion handler once no mouse button is held anymore"""
+        if self._motionCid is not None:
+            self.mpl_disconnect(self._motionCid)
+            self._motionCid = None
+        self._pendingMotion = None
+
+    @contextmanager
+    def batched_draws(self, draw=True):
+        """
+        Suppress redraw scheduling for all update calls inside the block; a single draw_idle is
+        issued once the outermost block ends. Handlers that blit their own frame instead pass
+        draw=False to skip even the terminal redraw
+        """
+        self._suppressDraw += 1
+        try:
+            yield
+        finally:
+            self._suppressDraw -= 1
+            if draw and not self._suppressDraw:
+                self.draw_idle()
+
+    def drag_artists(self):
+        """Yields all artists that move while node self.selectedNode is being dragged"""
+        v = self.selectedNode
+        for collection in (self.edgeCollection, self.boxCollection, self.arrowCollection):
+            if collection is not None and collection.axes is not None:
+                yield collection
+        for nodes, nodeCollection in self.nodeCollections:
+            if v in nodes:
+                yield nodeCollection
+        if v in self.nodeLabelCollection:
+            yield self.nodeLabelCollection[v]
+        for label in self.edgeLabelCollection.values():
+            yield label
+
+    def capture_drag_background(self):
+        """Rasterize all static artists once, so drag frames can be blitted instead of fully redrawn"""
+        # Isolate the dragged node in its own collection first, so the remaining collections stay static
+        with self.batched_draws(draw=False):
+            self.update_nodes(moved=True, color=True)
+
+        artists = list(self.drag_artists())
+        for artist in artists:
+            artist.set_visible(False)
+        self.draw()
+        self._dragBackground = self.copy_from_bbox(self.figure.bbox)
+        for artist in artists:
+            artist.set_visible(True)
+
+    def draw_drag_frame(self):
+        """Restore the cached background and re-draw only the moving artists"""
+        self.restore_region(self._dragBackground)
+        for artist in self.drag_artists():
+            self.axes.draw_artist(artist)
+        self.blit(self.figure.bbox)
+
+    def end_drag(self):
+        """Drop the blitting background and do one full redraw after a drag has finished"""
+        if self._dragBackground is not None:
+            self._dragBackground = None
+            self.draw_idle()
+
+    def on_resize(self, event):
+        """
+        Resize-event handling. A new canvas size changes the data-to-screen aspect ratio and with
+        it the rotation of every edge label
+        :param event: event which is emitted by matplotlib
+        """
+        self._transformDirty = True
+        self._dragBackground = None
+
     def on_scroll(self, event):
         """
         Scroll-Mouse-event handling
@@ -273,15 +441,42 @@ class PlotCanvas(FigureCanvas):
         :param clickpos: tuple containing absolute x and y value of click event
         :return: clicked edge (None if no edge has been selected)
         """
-        clickedEdge = None
-        for edge in self.network.edges():
-            startpos = self.network.nodes[edge[0]]['position']
-            endpos = self.network.nodes[edge[1]]['position']
-            dist = self.compute_dist_projection_on_segment(clickpos, startpos, endpos)
-            if 0 <= dist <= SIMILARITY_DIST:
-                clickedEdge = edge
-                break
-        return clickedEdge
+        if self._edgeHitCache is None:
+            self.build_edge_hit_cache()
+        edgeList, starts, ends, midpoints, tree, queryRadius = self._edgeHitCache
+        if not edgeList:
+            return None
+
+        # Prune the candidate set via the edge midpoints before running the exact projection
+        click = np.asarray(clickpos, dtype=float)
+        if tree is not None:
+            candidates = np.asarray(tree.query_ball_point(click, r=queryRadius), dtype=int)
+        else:
+            delta = midpoints - click
+            candidates = np.nonzero(np.einsum('ij,ij->i', delta, delta) <= queryRadius * queryRadius)[0]
+        if candidates.size == 0:
+            return None
+
+        distances = self.compute_dist_projection_on_segments(click, starts[candidates], ends[candidates])
+        hits = np.nonzero((distances >= 0) & (distances <= SIMILARITY_DIST))[0]
+        return edgeList[candidates[hits[0]]] if hits.size else None
+
+    def build_edge_hit_cache(self):
+        """Build the spatial index over all edges used by check_edge_clicked"""
+        edgeList = list(self.network.edges())
+        if edgeList:
+            # float32 halves the bytes moved per hit test; pixel-scale precision is more than enough here
+            starts = np.array([self.network.nodes[v]['position'] for v, w in edgeList], dtype=np.float32)
+            ends = np.array([self.network.nodes[w]['position'] for v, w in edgeList], dtype=np.float32)
+            midpoints = 0.5 * (starts + ends)
+            # The query radius has to cover half of the longest edge to not miss clicks near its endpoints
+            maxHalfLength = 0.5 * np.sqrt(((ends - starts) ** 2).sum(axis=1).max())
+            queryRadius = SIMILARITY_DIST + maxHalfLength
+            tree = cKDTree(midpoints) if cKDTree is not None else None
+        else:
+            starts, ends, midpoints = (np.empty((0, 2), dtype=np.float32),) * 3
+            tree, queryRadius = None, 0
+        self._edgeHitCache = (edgeList, starts, ends, midpoints, tree, queryRadius)
 
     @staticmethod
     def compute_dist_projection_on_segment(clickpos, startpos, endpos):
@@ -306,6 +501,25 @@ class PlotCanvas(FigureCanvas):
             # Return distance of projection to vector itself
             return np.linalg.norm(mu - x)
 
+    @staticmethod
+    def compute_dist_projection_on_segments(clickpos, starts, ends):
+        """
+        Vectorized version of compute_dist_projection_on_segment handling all segments in one pass
+        :param clickpos: array containing absolute x and y value of click event
+        :param starts: (E,2) array of segment start points
+        :param ends: (E,2) array of segment end points
+        :return: (E,) array of distances (-1 where the projection does not lie on the segment)
+        """
+        b = ends - starts
+        mu = np.asarray(clickpos) - starts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xScalar = np.einsum('ij,ij->i', mu, b) / np.einsum('ij,ij->i', b, b)
+        x = mu - xScalar[:, None] * b
+        distances = np.sqrt(np.einsum('ij,ij->i', x, x))
+        # The perpendicular projection of mu onto b has to lie on the segment [0, b]
+        distances[~((xScalar >= 0) & (xScalar <= 1))] = -1
+        return distances
+
     def check_node_clicked(self, clickpos, edgePossible=False):
         """
         Check whether a given click position clickpos was a click on a node
@@ -317,26 +531,55 @@ class PlotCanvas(FigureCanvas):
 
         xAbsolute, yAbsolute = clickpos[0], clickpos[1]
         clickedNode = None
-        minDist = float('inf')
-        positions = nx.get_node_attributes(self.network, 'position')
-        for node, pos in positions.items():
-            dist = sqrt((xAbsolute - pos[0]) ** 2 + (yAbsolute - pos[1]) ** 2)
-            if dist <= SIMILARITY_DIST:
-                clickedNode = node
-                break
-            elif dist <= minDist:
-                minDist = dist
-
-        if clickedNode is None and minDist > 2 * SIMILARITY_DIST and not edgePossible:
+        minDistSquared = float('inf')
+        if self._nodeHitCache is None:
+            self.build_node_hit_cache()
+        nodeList, nodePositions = self._nodeHitCache
+        if nodeList:
+            # Squared distance to all nodes in one vectorized pass; comparing against the
+            # squared thresholds saves taking the root
+            delta = nodePositions - np.array([xAbsolute, yAbsolute])
+            distancesSquared = np.einsum('ij,ij->i', delta, delta)
+            index = int(np.argmin(distancesSquared))
+            minDistSquared = distancesSquared[index]
+            if minDistSquared <= SIMILARITY_DIST ** 2:
+                clickedNode = nodeList[index]
+
+        if clickedNode is None and minDistSquared > (2 * SIMILARITY_DIST) ** 2 and not edgePossible:
             # Create new node
             nodeID = str(self.network.graph['lastID'])
             self.network.add_node(nodeID)
             self.network.nodes[nodeID]['position'] = (int(xAbsolute), int(yAbsolute))
             self.network.nodes[nodeID]['label'] = nodeID
             self.network.graph['lastID'] += 1
+            self._nodeHitCache = None
+            self._positionCache = None
             return nodeID
         return clickedNode
 
+    def node_positions(self):
+        """Returns dict of node positions without re-walking all nodes on every call"""
+        if self._positionCache is None:
+            self._positionCache = nx.get_node_attributes(self.network, 'position')
+        return self._positionCache
+
+    def edge_position_array(self):
+        """Returns contiguous (|E|, 2, 2) array of edge endpoint positions, cached between draws"""
+        if self._edgePosCache is None:
+            pos = self.node_positions()
+            # float32 is plenty for screen coordinates and halves the bandwidth of every draw
+            self._edgePosCache = np.array([(pos[v], pos[w]) for v, w in self._edgeList], dtype=np.float32)
+        return self._edgePosCache
+
+    def build_node_hit_cache(self):
+        """Build the node position array used by check_node_clicked"""
+        nodeList = list(self.network.nodes())
+        if nodeList:
+            nodePositions = np.array([self.network.nodes[v]['position'] for v in nodeList], dtype=np.float32)
+        else:
+            nodePositions = np.empty((0, 2), dtype=np.float32)
+        self._nodeHitCache = (nodeList, nodePositions)
+
     def edgeColor(self, v, w):
         """
         Function returning the color that should be used while drawing edges
@@ -354,11 +597,43 @@ class PlotCanvas(FigureCanvas):
                 return 'r'  # Red
         return 'black'  # Don't color resetting edges, thus edge should be black
 
+    def edgeColorRGBA(self, v, w):
+        """
+        Memoized RGBA variant of edgeColor. The colors only change along with the focused edge
+        (TFC flags are only toggled on the focused edge, which is drawn blue either way), so the
+        cache is simply dropped whenever the focus differs from the one it was built under.
+        :param v: tail node
+        :param w: head node
+        :return: RGBA tuple
+        """
+        if self._edgeColorCacheFocus != self.focusEdge:
+            self._edgeColorCache = {}
+            self._edgeColorCacheFocus = self.focusEdge
+        try:
+            return self._edgeColorCache[(v, w)]
+        except KeyError:
+            color = self.edgeColor(v, w)
+            rgba = self.RGBA.get(color)
+            if rgba is None:
+                rgba = colorConverter.to_rgba(color, 1)
+            self._edgeColorCache[(v, w)] = rgba
+            return rgba
+
     def init_plot(self):
         """
         Update canvas to plot new graph
         """
         self.figure.clf()  # Clear current figure window
+        self._edgeHitCache = None
+        self._nodeHitCache = None
+        self._positionCache = None
+        self._dragBackground = None
+        self._lastFocusNode = self.focusNode
+        self._lastFocusEdge = self.focusEdge
+        self._edgeColorCache = {}
+        self._edgeColorCacheFocus = self.focusEdge
+        self._labelRotationCache = {}
+        self._transformDirty = True
         self.axes = self.figure.add_axes([0, 0, 1, 1])
         # self.axes.set_aspect("equal")
         self.axes.set_xlim(self.Xlim)
@@ -366,10 +641,10 @@ class PlotCanvas(FigureCanvas):
 
         self.axes.axis('off')  # Hide axes in the plot
 
-        nodeLabelSize = int(round(self.nodeLabelFontSize))
-        edgeLabelSize = int(round(self.edgeLabelFontSize))
+        nodeLabelSize = self._nodeLabelSizeInt
+        edgeLabelSize = self._edgeLabelSizeInt
 
-        positions = nx.get_node_attributes(self.network, 'position')
+        positions = self.node_positions()
 
         # Plot Nodes
         self.nodeCollections = []
@@ -384,16 +659,10 @@ class PlotCanvas(FigureCanvas):
                                                         labels=nx.get_node_attributes(self.network, 'label'),
                                                         font_size=nodeLabelSize)
 
-        # Plot Edges
-        self.edgeCollections, self.boxCollections, self.arrowCollections = [], [], []
-        edgeColorList = [self.edgeColor(v, w) for v, w in self.network.edges()]
-        if edgeColorList:
-            edgeCollection, boxCollection, arrowCollection = self.draw_edges(self.network, pos=positions, ax=self.axes,
-                                                            arrow=True,
-                                                            edge_color=edgeColorList, width=self.edgeWidthSize)
-            self.edgeCollections.append((list(self.network.edges()), edgeCollection))
-            self.boxCollections.append((list(self.network.edges()), boxCollection))
-            self.arrowCollections.append((list(self.network.edges()), arrowCollection))
+        # Plot Edges. All edges live in one collection per category instead of one collection per add
+        self._edgeList = []
+        self.edgeCollection, self.boxCollection, self.arrowCollection = None, None, None
+        self.rebuild_edge_collections()
 
         additionalNodeLabels = self.get_additional_node_labels()
         if additionalNodeLabels:
@@ -408,12 +677,34 @@ class PlotCanvas(FigureCanvas):
             self.additionalNodeLabelCollection = {}
 
         self.edgeLabels = self.get_edge_labels()
+        self._lastEdgeLabelText = dict(self.edgeLabels)
 
         self.edgeLabelCollection = draw_networkx_edge_labels(self.network, pos=positions, ax=self.axes,
                                                              edge_labels=self.edgeLabels, font_size=edgeLabelSize)
 
         self.draw_idle()
 
+    def rebuild_edge_collections(self):
+        """Rebuild the single edge/box/arrow collections from the current network"""
+        for collection in (self.edgeCollection, self.boxCollection, self.arrowCollection):
+            if collection is not None and collection.axes is not None:
+                # The arrow collection is never added to the axes if showArrows is False
+                collection.remove()
+        self._edgeList = list(self.network.edges())
+        # Per-edge patches and segments cached for the incremental moved-path, rebuilt lazily
+        self._edgeSegments = None
+        self._boxPatches = None
+        self._arrowPatches = None
+        self._edgePosCache = None
+        if self._edgeList:
+            edgeColorList = [self.edgeColor(v, w) for v, w in self._edgeList]
+            self.edgeCollection, self.boxCollection, self.arrowCollection = \
+                self.draw_edges(self.network, pos=self.node_positions(), ax=self.axes, arrow=True,
+                                edgelist=self._edgeList, edge_color=edgeColorList, width=self.edgeWidthSize,
+                                box_pos=self.edge_position_array())
+        else:
+            self.edgeCollection, self.boxCollection, self.arrowCollection = None, None, None
+
     def update_plot(self):
         """Update the entire plot"""
         self.update_nodes()
@@ -427,7 +718,12 @@ class PlotCanvas(FigureCanvas):
         :param moved: If True then a node has been moved
         :param color: If True then the color of a node has changed
         """
-        nodeLabelSize = int(round(self.nodeLabelFontSize))
+        if added or removal or moved:
+            self._nodeHitCache = None
+            self._positionCache = None
+            self._edgePosCache = None
+
+        nodeLabelSize = self._nodeLabelSizeInt
         if removal or moved:
             # A node has been deleted
             v = self.focusNode
@@ -437,7 +733,9 @@ class PlotCanvas(FigureCanvas):
                     nodeCollection.remove()
                     nodes = [node for node in nodes if node != v]
                     if nodes:
-                        positions = {v: self.network.nodes[v]['position'] for v in self.network.nodes()}
+                        # draw_nodes only reads positions of the listed nodes, so there is no need
+                        # to build the dict over all nodes here
+                        positions = {node: self.network.nodes[node]['position'] for node in nodes}
                         newNodeCollection = self.draw_nodes(self.network,
                                                             pos=positions,
                                                             ax=self.axes, node_size=self.nodeSize,
@@ -472,8 +770,10 @@ class PlotCanvas(FigureCanvas):
                                          labels={v: self.network.nodes[v]['label']}, font_size=nodeLabelSize))
 
         # Update node label texts and positions
+        labelsChanged = False
         for v, label in self.nodeLabelCollection.items():  # type(label) = matplotlib.text.Text object
             if label.get_text() != self.network.nodes[v]['label']:
+                labelsChanged = True
                 label.remove()
                 self.nodeLabelCollection[v] = \
                     draw_networkx_labels(self.network, pos={v: self.network.nodes[v]['position']}, ax=self.axes,
@@ -482,13 +782,18 @@ class PlotCanvas(FigureCanvas):
                 label.set_position(self.network.nodes[v]['position'])
 
         if color:
+            if not (added or removal or moved) and not labelsChanged and self.focusNode == self._lastFocusNode:
+                # No-op recolor (e.g. clicking the already focused node), nothing to redraw
+                return
+            self._lastFocusNode = self.focusNode
             nodeColor = lambda v: 'r' if v != self.focusNode else 'b'
             # Update colors and position
             for nodes, nodeCollection in self.nodeCollections:
                 nodeColorList = [nodeColor(v) for v in nodes] if not removal else 'r'
                 nodeCollection.set_facecolors(nodeColorList)
 
-        self.draw_idle()
+        if not self._suppressDraw:
+            self.draw_idle()
 
     def update_edges(self, added=False, removal=False, moved=False, color=False):
         """
@@ -498,60 +803,35 @@ class PlotCanvas(FigureCanvas):
         :param moved: If True then an edge has been moved
         :param color: If True then the color of an edge has changed
         """
-        if removal:
-            # Edges have been deleted
-            collectionIndex = 0
-            toDeleteIndices = []
-            for edges, edgeCollection in self.edgeCollections:
-                missingEdges = [edge for edge in edges if edge not in self.network.edges()]
-                if missingEdges:
-                    boxCollection = self.boxCollections[collectionIndex][1]
-                    arrowCollection = self.arrowCollections[collectionIndex][1]
-                    edgeCollection.remove()
-                    boxCollection.remove()
-                    arrowCollection.remove()
-
-                    edges = [edge for edge in edges if edge not in missingEdges]
-                    if edges:
-                        positions = {v: self.network.nodes[v]['position'] for v in self.network.nodes()}
-                        newEdgeCollection, newBoxCollection, newArrowCollection = self.draw_edges(self.network, pos=positions,
-                                                                              ax=self.axes, arrow=True,
-                                                                              edgelist=edges, width=self.edgeWidthSize)
-                        self.edgeCollections[collectionIndex] = (edges, newEdgeCollection)
-                        self.boxCollections[collectionIndex] = (edges, newBoxCollection)
-                        self.arrowCollections[collectionIndex] = (edges, newArrowCollection)
-
-                    else:
-                        toDeleteIndices.append(collectionIndex)
-
-                    # Delete edge labels
-                    for edge in missingEdges:
-                        deletedLabel = self.edgeLabelCollection.pop(edge)
-                        deletedLabel.remove()
-
-                collectionIndex += 1
-
-            for index in reversed(toDeleteIndices):
-                del self.edgeCollections[index]
-                del self.boxCollections[index]
-                del self.arrowCollections[index]
+        if added or removal or moved:
+            self._edgeHitCache = None
+        if moved:
+            self._positionCache = None
+            self._edgePosCache = None
+        elif color and not (added or removal) and self.focusEdge == self._lastFocusEdge:
+            # No-op recolor (e.g. re-selecting the focused edge): the edge colors only depend
+            # on the focus state, so there is nothing to redraw
+            return
 
+        if removal:
+            # Edges have been deleted. Rebuilding the single collections is O(E), but deletion is a
+            # rare user action compared to the per-frame paths
+            currentEdges = set(self.network.edges())
+            missingEdges = [edge for edge in self._edgeList if edge not in currentEdges]
+            if missingEdges:
+                self.rebuild_edge_collections()
+
+                # Delete edge labels
+                for edge in missingEdges:
+                    deletedLabel = self.edgeLabelCollection.pop(edge)
+                    deletedLabel.remove()
 
         elif added:
-            # A node has been added (can we do better than plotting all nodes again)
+            # An edge has been added
             if self.focusEdge is not None:
                 v, w = self.focusEdge
-                edgeCollection, boxCollection, arrowCollection = self.draw_edges(self.network,
-                                                                pos={v: self.network.nodes[v]['position'],
-                                                                     w: self.network.nodes[w]['position']},
-                                                                ax=self.axes, arrow=True,
-                                                                edgelist=[self.focusEdge],
-                                                                width=self.edgeWidthSize)
-
-                self.edgeCollections.append(([self.focusEdge], edgeCollection))
-                self.boxCollections.append(([self.focusEdge], boxCollection))
-                self.arrowCollections.append(([self.focusEdge], arrowCollection))
-                edgeLabelSize = int(round(self.edgeLabelFontSize))
+                self.rebuild_edge_collections()
+                edgeLabelSize = self._edgeLabelSizeInt
                 if not self.onlyNTF:
                     if self.type == 'general':
                         lbl = {self.focusEdge: (self.network[v][w]['outCapacity'], self.network[v][w]['transitTime'])}
@@ -570,137 +850,186 @@ class PlotCanvas(FigureCanvas):
                                                                           font_size=edgeLabelSize))
 
         elif moved:
-            collectionIndex = 0
-            for edges, edgeCollection in self.edgeCollections:
-                pos = nx.get_node_attributes(self.network, 'position')
-
-                p = 0.3
-                edge_pos = []
-                for edge in edges:
-                    src, dst = np.array(pos[edge[0]]), np.array(pos[edge[1]])
-                    s = dst - src
-                    # src = src + p * s  # Box at beginning
-                    # dst = src + (1 - p) * s  # Box at the end
-                    dst = src  # No edge at all
-                    edge_pos.append((src, dst))
-
-                edge_pos = np.asarray(edge_pos)
-                box_pos = np.asarray([(pos[e[0]], pos[e[1]]) for e in edges])
+            if self.edgeCollection is not None:
+                pos = self.node_positions()
+                edges = self._edgeList
+                movedNode = self.selectedNode if self.selectedNode is not None else self.focusNode
+                if self._boxPatches is None or movedNode is None:
+                    # Build the per-edge patches and degenerate segments once; later calls only
+                    # touch the rows of edges incident to the moved node
+                    self._edgeSegments = np.asarray([(pos[v], pos[v]) for v, w in edges],
+                                                    dtype=np.float32)  # No edge at all
+                    self._boxPatches = [Utilities.make_box_patch(pos[v], pos[w]) for v, w in edges]
+                    self._arrowPatches = [Utilities.make_arrow_patch(pos[v], pos[w]) for v, w in edges]
+                else:
+                    for index, (v, w) in enumerate(edges):
+                        if movedNode != v and movedNode != w:
+                            continue
+                        self._edgeSegments[index] = (pos[v], pos[v])  # No edge at all
+                        self._boxPatches[index] = Utilities.make_box_patch(pos[v], pos[w])
+                        self._arrowPatches[index] = Utilities.make_arrow_patch(pos[v], pos[w])
+
                 # Move edges
-                edgeCollection.set_segments(edge_pos)
+                self.edgeCollection.set_segments(self._edgeSegments)
 
-                boxCollection = self.boxCollections[collectionIndex][1]
                 # Move boxes
-                boxCollection.remove()
-                boxCollection = Utilities.get_boxes(edge_pos=box_pos)
+                self.boxCollection.remove()
+                boxCollection = Utilities.get_boxes(patches=self._boxPatches)
                 boxCollection.set_zorder(1)  # edges go behind nodes
                 # boxCollection.set_label(label)
                 self.axes.add_collection(boxCollection)
-                self.boxCollections[collectionIndex] = (self.boxCollections[collectionIndex][0], boxCollection)
+                self.boxCollection = boxCollection
 
-                arrowCollection = self.arrowCollections[collectionIndex][1]
-                # Move boxes
-                arrowCollection.remove()
-                arrowCollection = Utilities.get_arrows_on_edges(edge_pos=box_pos)
-                arrowCollection.set_zorder(2)  # edges go behind nodes
-                # boxCollection.set_label(label)
-                self.axes.add_collection(arrowCollection)
-                self.arrowCollections[collectionIndex] = (self.arrowCollections[collectionIndex][0], arrowCollection)
-
-                collectionIndex += 1
+                # Move arrows
+                if self.arrowCollection is not None and self.arrowCollection.axes is not None:
+                    self.arrowCollection.remove()
+                    arrowCollection = Utilities.get_arrows_on_edges(patches=self._arrowPatches)
+                    arrowCollection.set_zorder(2)  # edges go behind nodes
+                    # boxCollection.set_label(label)
+                    self.axes.add_collection(arrowCollection)
+                    self.arrowCollection = arrowCollection
 
         if color:
-            # Update colors
+            # Update colors with one array write per collection
+            self._lastFocusEdge = self.focusEdge
             edgeSize = lambda v, w: self.edgeWidthSize if (v, w) != self.focusEdge else self.edgeWidthSize + 1
             boxSize = lambda v, w: 1 if (v, w) != self.focusEdge else 2
-            collectionIndex = 0
-            for edges, edgeCollection in self.edgeCollections:
-                if edges:
-                    edgeColorList = [colorConverter.to_rgba(self.edgeColor(v, w), 1) for v, w in
-                                     edges]
+            if self.edgeCollection is not None:
+                edges = self._edgeList
+                edgeColorList = [self.edgeColorRGBA(v, w) for v, w in edges]
 
-                    edgeCollection.set_color(edgeColorList)
-                    edgeCollection.set_linewidth([edgeSize(v, w) for v, w in edges])
+                self.edgeCollection.set_color(edgeColorList)
+                self.edgeCollection.set_linewidth([edgeSize(v, w) for v, w in edges])
 
-                    boxCollection = self.boxCollections[collectionIndex][1]
-                    boxCollection.set_edgecolor(edgeColorList)
-                    boxCollection.set_linewidth([boxSize(v, w) for v, w in edges])
+                self.boxCollection.set_edgecolor(edgeColorList)
+                self.boxCollection.set_linewidth([boxSize(v, w) for v, w in edges])
 
-                    arrowCollection = self.arrowCollections[collectionIndex][1]
-                    arrowCollection.set_edgecolor(edgeColorList)
-                collectionIndex += 1
+                if self.arrowCollection is not None:
+                    self.arrowCollection.set_edgecolor(edgeColorList)
 
         # Update edge label texts and positions
         lbls = self.get_edge_labels()
-        for edge, label in self.edgeLabelCollection.items():  # type(label) = matplotlib.text.Text object
-            v, w = edge
-            if self.focusNode is not None:
-                if v not in self.focusNode and w not in self.focusNode:
-                    # No need to update anything
-                    continue
-
-            lblTuple = lbls[(v, w)]
-            if label.get_text() != lblTuple:
-                label.set_text(lblTuple)
-            posv = (self.network.nodes[v]['position'][0] * 0.5, self.network.nodes[v]['position'][1] * 0.5)
-            posw = (self.network.nodes[w]['position'][0] * 0.5, self.network.nodes[w]['position'][1] * 0.5)
-            pos = (posv[0] + posw[0], posv[1] + posw[1])
-            label.set_position(pos)
-
-            rotAngle = Utilities.get_edge_label_rotation(self.axes, posv, posw, pos)
-            label.set_rotation(rotAngle)
+        changed = {edge for edge in self.edgeLabelCollection if self._lastEdgeLabelText.get(edge) != lbls.get(edge)}
+        # Positions only have to be refreshed after structural changes; otherwise unchanged labels are skipped
+        updateEdges = list(self.edgeLabelCollection) if (added or moved) else list(changed)
+        if self.focusNode is not None:
+            # Only edges incident to the focused node need an update. Note that node IDs are strings,
+            # so the previous 'v not in self.focusNode' check was an accidental substring test
+            incidentEdges = set(self.network.in_edges(self.focusNode)) | set(self.network.out_edges(self.focusNode))
+            updateEdges = [edge for edge in updateEdges if edge in incidentEdges]
+        for edge in updateEdges:
+            if edge in changed:
+                lblTuple = lbls[edge]
+                self.edgeLabelCollection[edge].set_text(lblTuple)  # type = matplotlib.text.Text object
+                self._lastEdgeLabelText[edge] = lblTuple
+        self._update_edge_label_layout(updateEdges)
+
+        if not self._suppressDraw:
+            self.draw_idle()
 
-        self.draw_idle()
+    def _update_edge_label_layout(self, edges):
+        """
+        Recompute positions and rotations of the given edge labels. Rotations only depend on the
+        node positions and the data-to-screen transform, so they are cached per edge and reused
+        for edges whose endpoints did not move while the transform stayed clean (e.g. panning)
+        :param edges: list of edges whose labels should be laid out
+        """
+        if not edges:
+            return
+        if self._transformDirty:
+            # Scale changed, every cached angle is stale
+            self._labelRotationCache = {}
+            self._transformDirty = False
+        positions = self.node_positions()
+        cache = self._labelRotationCache
+
+        staleEdges = []
+        for edge in edges:
+            v, w = edge
+            srcPos, dstPos = positions[v], positions[w]
+            mid = (0.5 * (srcPos[0] + dstPos[0]), 0.5 * (srcPos[1] + dstPos[1]))
+            cached = cache.get(edge)
+            if cached is not None and cached[0] == srcPos and cached[1] == dstPos:
+                label = self.edgeLabelCollection[edge]
+                label.set_position(mid)
+                label.set_rotation(cached[2])
+            else:
+                staleEdges.append((edge, srcPos, dstPos, mid))
+
+        if staleEdges:
+            # SoA layout: all stale rotations fall out of one vectorized pass
+            src = np.array([srcPos for edge, srcPos, dstPos, mid in staleEdges], dtype=float)
+            dst = np.array([dstPos for edge, srcPos, dstPos, mid in staleEdges], dtype=float)
+            mids = np.array([mid for edge, srcPos, dstPos, mid in staleEdges], dtype=float)
+            rotations = Utilities.get_edge_label_rotations(self.axes, src, dst, mids)
+            for index, (edge, srcPos, dstPos, mid) in enumerate(staleEdges):
+                rotation = rotations[index]
+                label = self.edgeLabelCollection[edge]
+                label.set_position(mid)
+                label.set_rotation(rotation)
+                cache[edge] = (srcPos, dstPos, rotation)
 
     def zoom(self, factor=None):
         """Zoom by factor"""
         if factor is not None:
-            smaller = lambda val: factor * val  # Returns smaller value if factor < 1, i.e. if zooming out
-            bigger = lambda val: (1. / factor) * val  # Returns bigger value if factor < 1, i.e. if zooming out
-        else:
-            smaller = lambda val: val
-            bigger = lambda val: val
+            # Scale limits and sizes; new arrays instead of in-place so stored viewpoints stay intact
+            self.Xlim = np.multiply(self.Xlim, 1. / factor)
+            self.Ylim = np.multiply(self.Ylim, 1. / factor)
+            self.edgeWidthSize *= factor
+            self.nodeLabelFontSize *= factor
+            self.edgeLabelFontSize *= factor
+
+        viewState = (self.Xlim[0], self.Xlim[1], self.Ylim[0], self.Ylim[1],
+                     self.edgeWidthSize, self.nodeLabelFontSize, self.edgeLabelFontSize)
+        if viewState == self._appliedViewState:
+            # Nothing changed (e.g. set_viewpoint restoring the current view), artists are up to date
+            if not self._suppressDraw:
+                self.draw_idle()
+            return
+        self._appliedViewState = viewState
+        self._dragBackground = None  # Limits change, so a cached drag background would be stale
+        self._transformDirty = True  # Scaled limits change the screen angles of the edge labels
 
-        # Scale axis
-        self.Xlim = tuple(bigger(entry) for entry in self.Xlim)
-        self.Ylim = tuple(bigger(entry) for entry in self.Ylim)
-        self.axes.set_xlim(self.Xlim)
-        self.axes.set_ylim(self.Ylim)
+        # With factor None the current state is simply re-applied to the artists (set_viewpoint)
+        self.axes.set_xlim(self.Xlim[0], self.Xlim[1])
+        self.axes.set_ylim(self.Ylim[0], self.Ylim[1])
 
         # Scale edge widths
-        self.edgeWidthSize = smaller(self.edgeWidthSize)
         # edgeWithSize = max(1, int(round(self.edgeWidthSize)))
-        for edges, edgeCollection in self.edgeCollections:
-            edgeCollection.set_linewidth(self.edgeWidthSize)
-
-        # Scale font size of node labels
-        self.nodeLabelFontSize = smaller(self.nodeLabelFontSize)
-        nodeLabelSize = int(round(self.nodeLabelFontSize))
-        for v, label in self.nodeLabelCollection.items():
-            label.set_fontsize(nodeLabelSize)
-
-        # Scale font size of Additional Node Labels, if existing
-        for v, label in self.additionalNodeLabelCollection.items():
-            label.set_fontsize(nodeLabelSize)
+        if self.edgeCollection is not None:
+            self.edgeCollection.set_linewidth(self.edgeWidthSize)
+
+        # Scale font size of node labels (setp batches the updates instead of a Python loop per dict).
+        # Sizes are positive, so int(x + 0.5) rounds without the round() dispatch; small zoom factors
+        # often leave the rounded size unchanged, in which case the labels are not touched at all
+        nodeLabelSize = int(self.nodeLabelFontSize + 0.5)
+        if nodeLabelSize != self._nodeLabelSizeInt:
+            self._nodeLabelSizeInt = nodeLabelSize
+            nodeLabels = list(self.nodeLabelCollection.values()) + list(self.additionalNodeLabelCollection.values())
+            if nodeLabels:
+                matplotlib.artist.setp(nodeLabels, fontsize=nodeLabelSize)
 
         # Scale font size of edge labels
-        self.edgeLabelFontSize = smaller(self.edgeLabelFontSize)
-        edgeLabelSize = int(round(self.edgeLabelFontSize))
-        for edge, label in self.edgeLabelCollection.items():
-            label.set_fontsize(edgeLabelSize)
+        edgeLabelSize = int(self.edgeLabelFontSize + 0.5)
+        if edgeLabelSize != self._edgeLabelSizeInt:
+            self._edgeLabelSizeInt = edgeLabelSize
+            if self.edgeLabelCollection:
+                matplotlib.artist.setp(list(self.edgeLabelCollection.values()), fontsize=edgeLabelSize)
 
-        self.draw_idle()
+        if not self._suppressDraw:
+            self.draw_idle()
 
     def move(self):
         """Move field of view"""
         dx = self.mouseWheelPosition[0] - self.mouseWheelPressedPosition[0]
         dy = self.mouseWheelPosition[1] - self.mouseWheelPressedPosition[1]
 
-        self.Xlim = tuple(entry - dx for entry in self.Xlim)
-        self.Ylim = tuple(entry - dy for entry in self.Ylim)
+        self.Xlim = np.subtract(self.Xlim, dx)
+        self.Ylim = np.subtract(self.Ylim, dy)
+        self._appliedViewState = None  # Limits changed outside of zoom()
 
-        self.axes.set_xlim(self.Xlim)
-        self.axes.set_ylim(self.Ylim)
+        self.axes.set_xlim(self.Xlim[0], self.Xlim[1])
+        self.axes.set_ylim(self.Ylim[0], self.Ylim[1])
 
     @staticmethod
     def draw_nodes(G,
@@ -744,6 +1073,7 @@ class PlotCanvas(FigureCanvas):
                    ax=None,
                    arrows=True,
                    label=None,
+                   box_pos=None,
                    **kwds):
         """Workaround to specify edge drawing function"""
 
@@ -759,4 +1089,5 @@ class PlotCanvas(FigureCanvas):
                                                edge_vmax,
                                                ax,
                                                arrows,
-                                               label)
+                                               label,
+                                               box_pos=box_pos)
@@ -108,6 +108,7 @@ class PlotNTFCanvas(PlotCanvas):
             # Wheel was clicked, move visible part of canvas
             self.mouseWheelPressed = True
             self.mouseWheelPressedPosition = (xAbsolute, yAbsolute)
+            self.connect_motion()
 
     def on_release(self, event):
         """
@@ -122,6 +123,7 @@ class PlotNTFCanvas(PlotCanvas):
             # Wheel has been released
             self.mouseWheelPressed = False
             self.mouseWheelPressedPosition = None
+            self.disconnect_motion()
 
     def on_motion(self, event):
         """
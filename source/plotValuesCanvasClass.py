@@ -6,10 +6,10 @@
 # ===========================================================================
 
 import matplotlib
+import numpy as np
 from matplotlib import figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-
-from source.utilitiesClass import Utilities
+from matplotlib.collections import LineCollection
 
 
 # ======================================================================================================================
@@ -21,11 +21,22 @@ class PlotValuesCanvas(FigureCanvas):
         super(PlotValuesCanvas, self).__init__(self.figure)  # Call parents constructor
 
         self.figure.patch.set_facecolor("lightgrey")
+        # One persistent axes instead of clf() + add_subplot per update; hidden until the first plot
+        self.axes = self.figure.add_subplot(111)
+        self.axes.set_visible(False)
+        self.linePool = []  # Persistent Line2D artists reused across update_plot calls
         self.plots = []
-        self.hLines = []
-        self.hLinesLabels = []
+        self.plotsNp = []  # x/y values of self.plots as numpy arrays, for C-level searchsorted
+        self._vlineIndexCache = []  # Last hline index per plot; scrubbing is mostly monotone
+        # All horizontal intersection lines share one LineCollection instead of one axhline each
+        self.hLineCollection = None
+        self._hLineEntries = []  # (plot line, segment) pairs backing the collection
+        self.hLineLabelPool = []  # Persistent Text artists with pre-built bboxes, reused per tick
+        self.hLinesLabels = []  # The currently active labels, a prefix of the pool
         self.legendToLineDict = dict()
         self.lineToHLineDict = dict()
+        self._legend = None  # Persistent legend, only rebuilt when the series labels change
+        self._legendLabels = None
         self.additionalColors = ['green', 'red', 'blue', 'orange']
         self.verticalLine = None
         self.verticalLinePos = 0
@@ -39,9 +50,14 @@ class PlotValuesCanvas(FigureCanvas):
         self.visibleBool = False
         self.picked = False
 
+        # Background of the static plot artists, cached for blitting the scrub artists
+        # (vertical line, hlines and their labels) without a full redraw per slider tick
+        self.background = None
+
         # Signals
         self.mpl_connect('button_press_event', self.on_click)
         self.mpl_connect('pick_event', self.on_click)
+        self.mpl_connect('draw_event', self.on_draw)
 
         # Enforce using PDFLatex instead of xetex
         pgf_with_pdflatex = {
@@ -60,65 +76,101 @@ class PlotValuesCanvas(FigureCanvas):
         :param additional_values: list of tuples: more values to plot
         :return: 
         """
-        self.figure.clf()
-        self.plots = []
-        self.hLines = []
+        # Drop the artists of the previous plot; the axes and the pooled lines themselves persist
+        self._hLineEntries = []
+        if self.hLineCollection is not None:
+            self.hLineCollection.set_segments([])
+        for label in self.hLineLabelPool:
+            label.set_visible(False)
         self.hLinesLabels = []
+        if self.storageHLine is not None:
+            self.storageHLine.remove()
+            self.storageHLine = None
+        self.plots = []
+        self.plotsNp = []
         self.legendToLineDict = dict()
         self.lineToHLineDict = dict()
-        self.storageHLine = None
 
-        axes = self.figure.add_subplot(111)
+        axes = self.axes
+        axes.set_visible(True)
         lines = []
 
-        yMin, yMax = min(yValues), max(yValues)
-        line, = axes.plot(xValues, yValues, linewidth=2, color=self.additionalColors[0], label=labels[0])
-        self.plots.append((xValues, yValues, line, labels[0]))
-        lines.append(line)
-        colorCounter = 1
-        for xVals, yVals in additional_values:
-            yMin, yMax = min(yMin, min(yVals)), max(yMax, max(yVals))
-            line, = axes.plot(xVals, yVals, linewidth=2, color=self.additionalColors[colorCounter],
-                              label=labels[colorCounter])
+        # Reuse the pooled Line2D artists; lines are only created/removed when the series count changes
+        allSeries = [(xValues, yValues)] + list(additional_values)
+        while len(self.linePool) < len(allSeries):
+            newLine, = axes.plot([], [], linewidth=2)
+            self.linePool.append(newLine)
+        while len(self.linePool) > len(allSeries):
+            self.linePool.pop().remove()
+
+        for colorCounter, (xVals, yVals) in enumerate(allSeries):
+            line = self.linePool[colorCounter]
+            line.set_data(xVals, yVals)
+            line.set_color(self.additionalColors[colorCounter])
+            line.set_label(labels[colorCounter])
+            line.set_visible(True)
             self.plots.append((xVals, yVals, line, labels[colorCounter]))
+            self.plotsNp.append((np.asarray(xVals, dtype=float), np.asarray(yVals, dtype=float)))
             lines.append(line)
-            colorCounter += 1
+
+        self._vlineIndexCache = [0] * len(self.plots)
+
+        # One pass over all series for the y-range instead of a min/max pair per series
+        allYValues = np.concatenate([yArr for xArr, yArr in self.plotsNp])
+        yMin, yMax = float(allYValues.min()), float(allYValues.max())
 
         axes.set_xlim(lowerBound, upperBound)
         axes.set_ylim(max(0, yMin), int(max(1, yMax) * 1.5))
 
-        legend = axes.legend(loc='upper left')
-
-        for idx, legend_entry in enumerate(legend.get_lines()):
-            legend_entry.set_picker(5)  # 5 pts tolerance
-            self.legendToLineDict[legend_entry] = lines[idx]
+        # Legend construction is one of the most expensive artist setups in matplotlib; reuse the
+        # existing legend when the same series are merely updated with new data
+        legendLabels = tuple(labels[:len(allSeries)])
+        if self._legend is None or legendLabels != self._legendLabels:
+            self._legend = axes.legend(loc='upper left')
+            self._legendLabels = legendLabels
+            for idx, legend_entry in enumerate(self._legend.get_lines()):
+                legend_entry.set_picker(5)  # 5 pts tolerance
+                self.legendToLineDict[legend_entry] = lines[idx]
+        else:
+            # The pooled Line2D artists keep their identity, so only the mapping and the alphas
+            # (possibly dimmed by earlier legend picks) have to be refreshed
+            for idx, legend_entry in enumerate(self._legend.get_lines()):
+                legend_entry.set_alpha(1.0)
+                self.legendToLineDict[legend_entry] = lines[idx]
 
         if storage is not None and axes.get_ylim()[0] <= storage <= axes.get_ylim()[1]:
             # Add the storage line
             self.add_storage_hline_to_plot(storage)
 
-        if lowerBound <= self.verticalLinePos <= upperBound:
-            self.verticalLine = axes.axvline(self.verticalLinePos, linewidth=self.verticalLineWidth)
-            self.verticalLine.set_color(self.verticalLineColor)
+        # The vertical line persists across updates; moving it is just a set_xdata call
+        self.update_vline_artist(lowerBound, upperBound)
+        if self.verticalLine.get_visible():
             self.add_hline_to_plots()
-        else:
-            self.verticalLine = None
 
         self.visibleBool = True
         self.draw_idle()
 
     def clear_plot(self):
         """Clear the plot"""
-        self.figure.clf()
+        self.axes.clear()  # Removes all artists from the persistent axes, including the line pool
+        self.axes.set_visible(False)
+        self.linePool = []
         self.plots = []
-        self.hLines = []
+        self.plotsNp = []
+        self._vlineIndexCache = []
+        self.hLineCollection = None  # Removed along with everything else by self.axes.clear()
+        self._hLineEntries = []
+        self.hLineLabelPool = []
         self.hLinesLabels = []
         self.legendToLineDict = dict()
         self.lineToHLineDict = dict()
+        self._legend = None
+        self._legendLabels = None
         self.draw_idle()
 
-        self.verticalLine = None  # self.verticalLine is automatically removed by self.figure.clf()
+        self.verticalLine = None  # self.verticalLine is automatically removed by self.axes.clear()
         self.storageHLine = None
+        self.background = None
 
         self.visibleBool = False
 
@@ -127,18 +179,54 @@ class PlotValuesCanvas(FigureCanvas):
         self.verticalLinePos = pos
 
         if self.visibleBool:
-            if self.verticalLine is not None:
-                self.verticalLine.remove()
-                self.verticalLine = None
+            lowerBound, upperBound = self.axes.get_xlim()
+            self.update_vline_artist(lowerBound, upperBound)
+            self.add_hline_to_plots()
+            self.draw_scrub_artists()
+
+    def update_vline_artist(self, lowerBound, upperBound):
+        """Move the persistent vertical line to verticalLinePos, creating the artist on first use"""
+        if self.verticalLine is None:
+            self.verticalLine = self.axes.axvline(self.verticalLinePos, linewidth=self.verticalLineWidth)
+            self.verticalLine.set_color(self.verticalLineColor)
+            self.verticalLine.set_animated(True)
+        else:
+            self.verticalLine.set_xdata([self.verticalLinePos, self.verticalLinePos])
+        self.verticalLine.set_visible(lowerBound <= self.verticalLinePos <= upperBound)
 
-            axes = self.figure.gca()
-            lowerBound, upperBound = axes.get_xlim()
+    def scrub_artists(self):
+        """Yields the artists following the vertical line while scrubbing the timeline"""
+        if self.verticalLine is not None:
+            yield self.verticalLine
+        if self.hLineCollection is not None:
+            yield self.hLineCollection
+        for label in self.hLinesLabels:
+            yield label
+
+    def on_draw(self, event):
+        """
+        Cache the freshly drawn background on every full draw. The scrub artists are animated and
+        thus excluded from it, so they are painted on top here and blitted in change_vline_position
+        :param event: event which is emitted by matplotlib
+        """
+        if self.visibleBool:
+            self.background = self.copy_from_bbox(self.figure.bbox)
+            axes = self.axes
+            for artist in self.scrub_artists():
+                axes.draw_artist(artist)
+        else:
+            self.background = None
 
-            if lowerBound <= self.verticalLinePos <= upperBound:
-                self.verticalLine = axes.axvline(self.verticalLinePos, linewidth=self.verticalLineWidth)
-                self.verticalLine.set_color(self.verticalLineColor)
-                self.add_hline_to_plots()
-                self.draw_idle()
+    def draw_scrub_artists(self):
+        """Restore the cached background and blit only the scrub artists over it"""
+        if self.background is None:
+            self.draw_idle()
+            return
+        self.restore_region(self.background)
+        axes = self.axes
+        for artist in self.scrub_artists():
+            axes.draw_artist(artist)
+        self.blit(self.figure.bbox)
 
     def on_click(self, event):
         """
@@ -174,13 +262,14 @@ class PlotValuesCanvas(FigureCanvas):
         visibility = not line.get_visible()
         line.set_visible(visibility)
 
-        # Change visibility of hLines if they exist
+        # Change visibility of the hline label; the shared collection only carries segments of
+        # visible plot lines, so it simply gets rebuilt
         try:
-            hLine, hLineText = self.lineToHLineDict[line]
-            hLine.set_visible(visibility)
+            hLineText = self.lineToHLineDict[line]
             hLineText.set_visible(visibility)
         except KeyError:
             pass
+        self.refresh_hline_segments()
 
         # Change alpha of legend to indicate visibility
         if visibility:
@@ -194,8 +283,8 @@ class PlotValuesCanvas(FigureCanvas):
         # Hide Lines for export
         if self.verticalLine is not None:
             self.verticalLine.set_visible(False)
-            for l in self.hLines:
-                l.set_visible(False)
+            if self.hLineCollection is not None:
+                self.hLineCollection.set_visible(False)
             for label in self.hLinesLabels:
                 label.set_visible(False)
 
@@ -205,57 +294,101 @@ class PlotValuesCanvas(FigureCanvas):
         # Show Lines again
         if self.verticalLine is not None:
             self.verticalLine.set_visible(True)
-            for l in self.hLines:
-                l.set_visible(True)
+            if self.hLineCollection is not None:
+                self.hLineCollection.set_visible(True)
             for label in self.hLinesLabels:
                 label.set_visible(True)
         self.draw_idle()
 
     def add_storage_hline_to_plot(self, storage):
         """Add storage horizontal line to the plot"""
-        axes = self.figure.gca()
+        axes = self.axes
         self.storageHLine = axes.axhline(y=storage, linewidth=self.storageHLineWidth)
         self.storageHLine.set_color(self.storageHLineColor)
 
+    def ensure_hline_collection(self):
+        """Create the shared collection holding all horizontal intersection lines on first use"""
+        if self.hLineCollection is None:
+            axes = self.axes
+            # x-coordinates in axes fraction, y-coordinates in data space, like axhline(xmin=...)
+            self.hLineCollection = LineCollection([], linewidths=self.verticalLineWidth,
+                                                  colors=self.verticalLineColor,
+                                                  transform=axes.get_yaxis_transform())
+            self.hLineCollection.set_animated(True)
+            axes.add_collection(self.hLineCollection)
+
+    def refresh_hline_segments(self):
+        """Push the segments of all hlines whose plot line is visible into the shared collection"""
+        if self.hLineCollection is not None:
+            self.hLineCollection.set_segments([segment for line, segment in self._hLineEntries
+                                               if line.get_visible()])
+
+    def locate_vline_index(self, plotIndex, xArr, pos):
+        """
+        Find the insertion index of pos in xArr, reusing the index of the previous scrub tick.
+        Dragging moves pos monotonically in small steps, so the cursor usually stays in the same
+        or the adjacent interval and the O(log L) search is only the fallback
+        :param plotIndex: index of the plot series in self.plots
+        :param xArr: sorted numpy array of x values
+        :param pos: position of the vertical line
+        :return: insertion index of pos in xArr
+        """
+        lastIndex = self._vlineIndexCache[plotIndex]
+        for candidate in (lastIndex, lastIndex + 1):
+            if 0 < candidate < len(xArr) and xArr[candidate - 1] < pos <= xArr[candidate]:
+                self._vlineIndexCache[plotIndex] = candidate
+                return candidate
+        index = int(np.searchsorted(xArr, pos, side='left'))
+        self._vlineIndexCache[plotIndex] = index
+        return index
+
     def add_hline_to_plots(self):
         """Add horizontal lines to intersect vertical line"""
-        for hLine in self.hLines:
-            hLine.remove()
-        self.hLines = []
+        self._hLineEntries = []
         self.lineToHLineDict = dict()
-
-        for label in self.hLinesLabels:
-            label.remove()
         self.hLinesLabels = []
 
-        for plot in self.plots:
+        self.ensure_hline_collection()
+        axes = self.axes
+        lowerBound, upperBound = axes.get_xlim()
+        labelIndex = 0
+
+        for plotIndex, (plot, plotNp) in enumerate(zip(self.plots, self.plotsNp)):
             xVals, yVals, line, label = plot
+            xArr, yArr = plotNp
 
-            # Get the y-value of self.verticalLinePos
-            index = Utilities.get_insertion_point_left(xVals, self.verticalLinePos)
-            if index == len(xVals) or index == 0:
+            # Get the y-value of self.verticalLinePos; the cursor cache makes repeated scrubs O(1)
+            index = self.locate_vline_index(plotIndex, xArr, self.verticalLinePos)
+            if index == len(xArr) or index == 0:
                 continue
-            x1, x, x2 = xVals[index - 1], self.verticalLinePos, xVals[index]
-            y1, y2 = yVals[index - 1], yVals[index]
+            x1, x, x2 = xArr[index - 1], self.verticalLinePos, xArr[index]
+            y1, y2 = yArr[index - 1], yArr[index]
             # It holds xVals[index-1] < self.verticalLinePos <= xVals[index]
             fac = float(x - x2) / (x1 - x2)
             y = fac * y1 + (1 - fac) * y2  # this obviously only works if plots are piecewise linear
 
-            axes = self.figure.gca()
-            lowerBound, upperBound = axes.get_xlim()
             lineBeginFac = float(x - lowerBound) / (upperBound - lowerBound)
-            hLine = axes.axhline(y=y, xmin=lineBeginFac, xmax=1, linewidth=self.verticalLineWidth)
-            hLine.set_color(self.verticalLineColor)
-            self.hLines.append(hLine)
-            hLineText = axes.text(1.02, y, "%.2f" % y, va='center', ha="left", bbox=dict(facecolor="w", alpha=0.5),
-                                  transform=axes.get_yaxis_transform())
-            hLineText.set_fontsize(8)
+            self._hLineEntries.append((line, [(lineBeginFac, y), (1, y)]))
+            # Reuse a pooled Text artist; the bbox patch is only allocated when the pool grows
+            if labelIndex == len(self.hLineLabelPool):
+                pooledText = axes.text(1.02, 0, "", va='center', ha="left", bbox=dict(facecolor="w", alpha=0.5),
+                                       transform=axes.get_yaxis_transform())
+                pooledText.set_fontsize(8)
+                pooledText.set_animated(True)
+                self.hLineLabelPool.append(pooledText)
+            hLineText = self.hLineLabelPool[labelIndex]
+            labelIndex += 1
+            hLineText.set_position((1.02, y))
+            hLineText.set_text("%.2f" % y)
+            hLineText.set_visible(line.get_visible())
             self.hLinesLabels.append(hLineText)
+            self.lineToHLineDict[line] = hLineText
+
+        # Hide pooled labels that are unused this tick
+        for surplusText in self.hLineLabelPool[labelIndex:]:
+            surplusText.set_visible(False)
 
-            if not line.get_visible():
-                hLine.set_visible(False)
-                hLineText.set_visible(False)
-            self.lineToHLineDict[line] = (hLine, hLineText)
+        self.refresh_hline_segments()
 
     def get_approx_data(self, t):
         """
@@ -264,17 +397,18 @@ class PlotValuesCanvas(FigureCanvas):
         :return: z_e(t), d_e(t),  where entries can be "N/A"
         """
         D = {'Queue size': "N/A", 'Load': "N/A"}
-        for plot in self.plots:
+        for plot, plotNp in zip(self.plots, self.plotsNp):
             xVals, yVals, line, label = plot
             if label != 'Load' and label != "Queue size":
                 continue
+            xArr, yArr = plotNp
 
-            index = Utilities.get_insertion_point_left(xVals, t)
-            if index == len(xVals) or index == 0:
+            index = int(np.searchsorted(xArr, t, side='left'))
+            if index == len(xArr) or index == 0:
                 continue
             else:
-                x1, x, x2 = xVals[index - 1], t, xVals[index]
-                y1, y2 = yVals[index - 1], yVals[index]
+                x1, x, x2 = xArr[index - 1], t, xArr[index]
+                y1, y2 = yArr[index - 1], yArr[index]
                 # It holds: xVals[index-1] < t <= xVals[index]
                 fac = float(x - x2) / (x1 - x2)
                 y = fac * y1 + (1 - fac) * y2  # this obviously only works if plots are piecewise linear
@@ -15,6 +15,14 @@ import numpy as np
 from matplotlib.collections import PatchCollection
 from matplotlib.patches import Rectangle, Circle, FancyArrowPatch
 
+try:
+    # Compiled Dijkstra used in get_shortest_path_network. Optional, as SciPy is not a hard requirement
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+except ImportError:
+    csr_matrix = None
+    csgraph_dijkstra = None
+
 # ======================================================================================================================
 
 
@@ -22,9 +30,30 @@ TOL = 1e-3  # Tolerance
 
 
 class Utilities:
+    rgbaCache = {}  # Memoized colorConverter results, keyed by (color, alpha)
+
     def __init__(self):
         pass
 
+    @staticmethod
+    def cached_rgba(color, alpha=None):
+        """
+        Memoized variant of colorConverter.to_rgba
+        :param color: matplotlib color spec
+        :param alpha: alpha value
+        :return: RGBA tuple
+        """
+        from matplotlib.colors import colorConverter
+        try:
+            return Utilities.rgbaCache[(color, alpha)]
+        except TypeError:
+            # Unhashable color spec (e.g. a list), convert without caching
+            return colorConverter.to_rgba(color, alpha)
+        except KeyError:
+            rgba = colorConverter.to_rgba(color, alpha)
+            Utilities.rgbaCache[(color, alpha)] = rgba
+            return rgba
+
     @staticmethod
     def create_dir(path):
         """
@@ -75,9 +104,9 @@ class Utilities:
         return (Utilities.is_leq_tol(a, x) and Utilities.is_leq_tol(x, b))
 
     @staticmethod
-    def get_insertion_point_left(L, el):
-        """Get insertion point of element el in list L"""
-        return bisect.bisect_left(L, el)
+    def get_insertion_point_left(L, el, lo=0):
+        """Get insertion point of element el in list L, searching only from index lo onwards"""
+        return bisect.bisect_left(L, el, lo)
 
     @staticmethod
     def get_edge_label_rotation(axes, src, dst, pos):
@@ -98,6 +127,48 @@ class Utilities:
                                                       xy.reshape((1, 2)))[0]
         return trans_angle
 
+    @staticmethod
+    def get_edge_label_rotations(axes, src, dst, pos):
+        """
+        Vectorized variant of get_edge_label_rotation for (N,2) arrays of positions
+        :return: array of N screen coordinate angles
+        """
+        delta = np.asarray(dst, dtype=float) - np.asarray(src, dtype=float)
+        angles = np.degrees(np.arctan2(delta[:, 1], delta[:, 0]))
+        # make label orientation "right-side-up"
+        angles[angles > 90] -= 180
+        angles[angles < -90] += 180
+        # transform data coordinate angles to screen coordinate angles in one batched call
+        return axes.transData.transform_angles(angles, np.asarray(pos, dtype=float))
+
+    @staticmethod
+    def get_distances_from_source(network, source='s', weight='transitTime'):
+        """
+        Computes shortest distances from source to all reachable nodes
+        :param network: networkx digraph
+        :param source: source node
+        :param weight: string-name of the edge weight attribute
+        :return: dict {node: distance} containing only reachable nodes
+        """
+        if csgraph_dijkstra is None:
+            # SciPy not available, fall back to the NetworkX implementation
+            return nx.single_source_dijkstra_path_length(G=network, source=source, weight=weight)
+
+        # Run the compiled CSR-based Dijkstra instead of the pure Python one
+        nodes = list(network.nodes())
+        nodeIndex = {node: index for index, node in enumerate(nodes)}
+        numberOfNodes = len(nodes)
+        rowIndices, colIndices, weights = [], [], []
+        for v, w, weightValue in network.edges(data=weight):
+            rowIndices.append(nodeIndex[v])
+            colIndices.append(nodeIndex[w])
+            weights.append(weightValue)
+        matrix = csr_matrix((weights, (rowIndices, colIndices)), shape=(numberOfNodes, numberOfNodes))
+        distances = csgraph_dijkstra(matrix, directed=True, indices=nodeIndex[source])
+        # Unreachable nodes get inf and are omitted, matching single_source_dijkstra_path_length
+        return {node: float(distances[index]) for index, node in enumerate(nodes)
+                if distances[index] < float('inf')}
+
     @staticmethod
     def get_shortest_path_network(network, labels=None):
         """
@@ -109,36 +180,33 @@ class Utilities:
 
         if not labels:
             # Use transit-times as edge weight
-            labels = nx.single_source_dijkstra_path_length(G=network, source='s',
-                                                           weight='transitTime')  # Compute node distance from source
+            labels = Utilities.get_distances_from_source(network, source='s',
+                                                         weight='transitTime')  # Compute node distance from source
 
         # Create shortest path network containing _all_ shortest paths
         # shortestPathEdges = [(edge[0], edge[1]) for edge in network.edges() if labels[edge[0]] + network[edge[0]][edge[1]]['transitTime'] <= labels[edge[1]]]
 
-        shortestPathEdges = [(edge[0], edge[1]) for edge in network.edges() if Utilities.is_geq_tol(labels[edge[1]],
-                                                                                                    labels[edge[0]] +
-                                                                                                    network[edge[0]][
-                                                                                                        edge[1]][
-                                                                                                        'transitTime'])]
+        # One pass over the edge data; the tolerance check is is_geq_tol inlined
+        shortestPathEdges = [(v, w, {'outCapacity': d['outCapacity'], 'transitTime': d['transitTime']})
+                             for v, w, d in network.edges(data=True)
+                             if labels[w] - (labels[v] + d['transitTime']) + TOL >= 0]
         shortestPathNetwork = nx.DiGraph()
         shortestPathNetwork.add_nodes_from(network)
         shortestPathNetwork.add_edges_from(shortestPathEdges)
-
-        for edge in shortestPathEdges:
-            v, w = edge[0], edge[1]
-            shortestPathNetwork[v][w]['outCapacity'] = network[v][w]['outCapacity']
-            shortestPathNetwork[v][w]['transitTime'] = network[v][w]['transitTime']
-            '''
+        '''
+        for v, w, d in shortestPathEdges:
             try:
                 shortestPathNetwork[v][w]['inflowBound'] = network[v][w]['inflowBound'].items()[-1]
             except KeyError:
                 continue
-            '''
+        '''
 
+        networkNodes = network.nodes
         for w in shortestPathNetwork:
+            nodeData = networkNodes[w]
             shortestPathNetwork.nodes[w]['dist'] = labels[w]
-            shortestPathNetwork.nodes[w]['label'] = network.nodes[w]['label']
-            shortestPathNetwork.nodes[w]['position'] = network.nodes[w]['position']
+            shortestPathNetwork.nodes[w]['label'] = nodeData['label']
+            shortestPathNetwork.nodes[w]['position'] = nodeData['position']
 
         return shortestPathNetwork
 
@@ -150,11 +218,10 @@ class Utilities:
         :param attr: string-name of the attribute accessible through network[v][w][attr]
         :return: min(network[v][w][attr] | (v,w) in network.edges)
         """
-        minAttr = float('inf')
-        for edge in network.edges():
-            v, w = edge[0], edge[1]
-            minAttr = min([minAttr, network[v][w][attr]])
-        return minAttr
+        # C-level reduction instead of a min() call per edge
+        attrValues = np.fromiter((d[attr] for v, w, d in network.edges(data=True)),
+                                 dtype=np.float64, count=network.number_of_edges())
+        return float(attrValues.min()) if attrValues.size else float('inf')
 
     @staticmethod
     def join_intersect_dicts(dict1, dict2=None, *more_dicts):
@@ -203,6 +270,7 @@ class Utilities:
                               ax=None,
                               arrows=True,
                               label=None,
+                              box_pos=None,
                               **kwds):
         try:
             import matplotlib
@@ -228,17 +296,11 @@ class Utilities:
 
         # set edge positions
 
-        box_pos = numpy.asarray([(pos[e[0]], pos[e[1]]) for e in edgelist])
-        p = 0.25
-        edge_pos = []
-        for edge in edgelist:
-            src, dst = np.array(pos[edge[0]]), np.array(pos[edge[1]])
-            s = dst - src
-            # src = src + p * s  # Box at beginning
-            # dst = src + (1-p) * s   # Box at the end
-            dst = src  # No edge at all
-            edge_pos.append((src, dst))
-        edge_pos = numpy.asarray(edge_pos)
+        if box_pos is None:
+            box_pos = numpy.asarray([(pos[e[0]], pos[e[1]]) for e in edgelist])
+        # Degenerate segments (dst = src, i.e. no edge at all) derived from box_pos in one go
+        edge_pos = box_pos.astype(float).copy()
+        edge_pos[:, 1] = edge_pos[:, 0]
 
         if not cb.iterable(width):
             lw = (width,)
@@ -252,7 +314,7 @@ class Utilities:
                               for c in edge_color]):
                 # (should check ALL elements)
                 # list of color letters such as ['k','r','k',...]
-                edge_colors = tuple([colorConverter.to_rgba(c, alpha)
+                edge_colors = tuple([Utilities.cached_rgba(c, alpha)
                                      for c in edge_color])
             elif numpy.alltrue([not cb.is_scalar_or_string(c)
                                 for c in edge_color]):
@@ -267,7 +329,7 @@ class Utilities:
                 raise ValueError('edge_color must consist of either color names or numbers')
         else:
             if cb.is_scalar_or_string(edge_color) or len(edge_color) == 1:
-                edge_colors = (colorConverter.to_rgba(edge_color, alpha),)
+                edge_colors = (Utilities.cached_rgba(edge_color, alpha),)
             else:
                 raise ValueError(
                     'edge_color must be a single color or list of exactly m colors where m is the number or edges')
@@ -328,6 +390,7 @@ class Utilities:
                              ax=None,
                              arrows=True,
                              label=None,
+                             box_pos=None,
                              **kwds):
         try:
             import matplotlib
@@ -353,17 +416,11 @@ class Utilities:
 
         # set edge positions
 
-        box_pos = numpy.asarray([(pos[e[0]], pos[e[1]]) for e in edgelist])
-        p = 0.25
-        edge_pos = []
-        for edge in edgelist:
-            src, dst = np.array(pos[edge[0]]), np.array(pos[edge[1]])
-            s = dst - src
-            # src = src + p * s  # Box at beginning
-            # dst = src + (1-p) * s   # Box at the end
-            dst = src  # No edge at all
-            edge_pos.append((src, dst))
-        edge_pos = numpy.asarray(edge_pos)
+        if box_pos is None:
+            box_pos = numpy.asarray([(pos[e[0]], pos[e[1]]) for e in edgelist])
+        # Degenerate segments (dst = src, i.e. no edge at all) derived from box_pos in one go
+        edge_pos = box_pos.astype(float).copy()
+        edge_pos[:, 1] = edge_pos[:, 0]
 
         if not cb.iterable(width):
             lw = (width,)
@@ -377,7 +434,7 @@ class Utilities:
                               for c in edge_color]):
                 # (should check ALL elements)
                 # list of color letters such as ['k','r','k',...]
-                edge_colors = tuple([colorConverter.to_rgba(c, alpha)
+                edge_colors = tuple([Utilities.cached_rgba(c, alpha)
                                      for c in edge_color])
             elif numpy.alltrue([not cb.is_scalar_or_string(c)
                                 for c in edge_color]):
@@ -392,7 +449,7 @@ class Utilities:
                 raise ValueError('edge_color must consist of either color names or numbers')
         else:
             if cb.is_scalar_or_string(edge_color) or len(edge_color) == 1:
-                edge_colors = (colorConverter.to_rgba(edge_color, alpha),)
+                edge_colors = (Utilities.cached_rgba(edge_color, alpha),)
             else:
                 raise ValueError(
                     'edge_color must be a single color or list of exactly m colors where m is the number or edges')
@@ -422,8 +479,7 @@ class Utilities:
         ax.add_collection(edge_collection)
 
         tube_collection = LineCollection(edge_pos,
-                                         colors=tuple([colorConverter.to_rgba('lightgrey', alpha)
-                                                       for c in edge_color]),
+                                         colors=(Utilities.cached_rgba('lightgrey', alpha),) * len(edge_color),
                                          linewidths=4,
                                          antialiaseds=(1,),
                                          linestyle=style,
@@ -469,7 +525,36 @@ class Utilities:
     '''Modified function networkx.draw_networkx_edges'''
 
     @staticmethod
-    def get_arrows_on_edges(edge_colors=None, edge_pos=None, width=1.0):
+    def make_arrow_patch(src, dst):
+        """
+        Build the arrow patch drawn at the beginning of a single edge
+        :param src: position of the tail node
+        :param dst: position of the head node
+        :return: FancyArrowPatch (None if source and target are at the same position)
+        """
+        src = np.array(src)
+        dst = np.array(dst)
+        p = 0.3
+        s = dst - src
+        start = src
+
+        if s[0] == 0 and s[1] == 0:  # source and target at same position
+            return None
+        #angle = np.rad2deg(np.arctan2(s[1], s[0]))
+        #t = matplotlib.transforms.Affine2D().rotate_deg_around(start[0], start[1], angle)
+
+        end = start + p*s
+        return FancyArrowPatch(start, end,
+                               arrowstyle='simple',
+                               shrinkA=2,
+                               shrinkB=2,
+                               mutation_scale=10,
+                               linewidth=10,
+                               connectionstyle=None,
+                               zorder=1)  # arrows go behind nodes
+
+    @staticmethod
+    def get_arrows_on_edges(edge_colors=None, edge_pos=None, width=1.0, patches=None):
         import matplotlib.pyplot as plt
         import matplotlib.cbook as cb
         from matplotlib.colors import colorConverter
@@ -481,37 +566,12 @@ class Utilities:
             lw = width
 
         if edge_colors is None:
-            edge_colors = tuple([colorConverter.to_rgba(c)
-                                 for c in 'k'])
+            edge_colors = (Utilities.cached_rgba('k'),)
 
-        arrows = []
+        if patches is None:
+            patches = [Utilities.make_arrow_patch(src, dst) for src, dst in edge_pos]
+        arrows = [patch for patch in patches if patch is not None]
         arrow_colors = edge_colors
-        p = 0.3
-        for src, dst in edge_pos:
-            src = np.array(src)
-            dst = np.array(dst)
-            d = np.sqrt(np.sum(((dst - src) * p) ** 2))
-            s = dst - src
-            start = src
-
-            if d == 0:  # source and target at same position
-                continue
-            #angle = np.rad2deg(np.arctan2(s[1], s[0]))
-            #t = matplotlib.transforms.Affine2D().rotate_deg_around(start[0], start[1], angle)
-
-            end = start + p*s
-            arrow = FancyArrowPatch(start, end,
-                                    arrowstyle='simple',
-                                    shrinkA=2,
-                                    shrinkB=2,
-                                    mutation_scale=10,
-                                    linewidth=10,
-                                    connectionstyle=None,
-                                    zorder=1)  # arrows go behind nodes
-            arrows.append(arrow)
-
-            # ax.add_patch(rec)
-            # ax.plot([src[0], dst[0]], [src[1], dst[1]], lw=2, solid_capstyle="butt", zorder=0, color='r')
 
         arrow_collection = PatchCollection(arrows,
                                            linewidths=[ww for ww in lw],
@@ -523,7 +583,37 @@ class Utilities:
         return arrow_collection
 
     @staticmethod
-    def get_boxes(edge_colors=None, edge_pos=None, width=1.0):
+    def make_box_patch(src, dst, d=None, angle=None):
+        """
+        Build the rotated rectangle covering a single edge
+        :param src: position of the tail node
+        :param dst: position of the head node
+        :param d: edge length, if already computed
+        :param angle: edge angle in degrees, if already computed
+        :return: Rectangle (None if source and target are at the same position)
+        """
+        src = np.array(src)
+        dst = np.array(dst)
+        # p = 0.25  # 1/4 of edge should be the box
+        p = 1
+        radius = 7
+        if d is None:
+            s = dst - src
+            d = np.sqrt(np.sum((s * p) ** 2))
+            angle = np.rad2deg(np.arctan2(s[1], s[0]))
+        # box_location = src  # Box at Beginning
+        # box_location = src + (1-p)*s  # Box at End
+        box_location = src  # Entire edge is box
+
+        if d == 0:  # source and target at same position
+            return None
+        delta = np.array([0, radius])
+        t = matplotlib.transforms.Affine2D().rotate_deg_around(box_location[0], box_location[1], angle)
+        return Rectangle(box_location - delta, width=d, height=radius * 2,
+                         transform=t)
+
+    @staticmethod
+    def get_boxes(edge_colors=None, edge_pos=None, width=1.0, patches=None):
         import matplotlib.pyplot as plt
         import matplotlib.cbook as cb
         from matplotlib.colors import colorConverter
@@ -535,31 +625,18 @@ class Utilities:
             lw = width
 
         if edge_colors is None:
-            edge_colors = tuple([colorConverter.to_rgba(c)
-                                 for c in 'k'])
-
-        rectangles = []
+            edge_colors = (Utilities.cached_rgba('k'),)
+
+        if patches is None:
+            # Lengths and angles of all edges in one vectorized pass instead of per-edge trig
+            edge_pos = np.asarray(edge_pos, dtype=float)
+            delta = edge_pos[:, 1] - edge_pos[:, 0]
+            dists = np.hypot(delta[:, 0], delta[:, 1])
+            angles = np.degrees(np.arctan2(delta[:, 1], delta[:, 0]))
+            patches = [Utilities.make_box_patch(src, dst, d=d, angle=angle)
+                       for (src, dst), d, angle in zip(edge_pos, dists, angles)]
+        rectangles = [patch for patch in patches if patch is not None]
         box_colors = edge_colors
-        # p = 0.25  # 1/4 of edge should be the box
-        p = 1
-        radius = 7
-        for src, dst in edge_pos:
-            src = np.array(src)
-            dst = np.array(dst)
-            d = np.sqrt(np.sum(((dst - src) * p) ** 2))
-            s = dst - src
-            # box_location = src  # Box at Beginning
-            # box_location = src + (1-p)*s  # Box at End
-            box_location = src  # Entire edge is box
-
-            if d == 0:  # source and target at same position
-                continue
-            angle = np.rad2deg(np.arctan2(s[1], s[0]))
-            delta = np.array([0, radius])
-            t = matplotlib.transforms.Affine2D().rotate_deg_around(box_location[0], box_location[1], angle)
-            rec = Rectangle(box_location - delta, width=d, height=radius * 2,
-                            transform=t)
-            rectangles.append(rec)
 
         box_collection = PatchCollection(rectangles,
                                            linewidths=[ww for ww in lw],